@@ -5,21 +5,90 @@ for BTC and ETH from 2024/11/1 to 2025/11/1
 """
 
 import os
+import logging
 import requests
-import json
+import ijson
+import orjson
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+import re
 import time
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # CryptoPanic API configuration
 API_KEY = os.getenv('CRYPTOPANIC_API_KEY')
 # Try different possible API endpoints
 BASE_URL = 'https://cryptopanic.com/api/v1/posts/'
 
+# Target request rate for the page loop (2 requests per second)
+REQUEST_INTERVAL = 0.5
+
+# Fast path for the ISO timestamps CryptoPanic returns: one regex match plus
+# six int conversions, no exceptions raised on the happy path
+_ISO_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})')
+
+
+def _parse_post_date(date_str):
+    """Parse a single post timestamp to a naive datetime (None if unparseable)"""
+    if not isinstance(date_str, str):
+        return None
+    m = _ISO_RE.match(date_str)
+    if m:
+        return datetime(int(m[1]), int(m[2]), int(m[3]), int(m[4]), int(m[5]), int(m[6]))
+    # Fallback for anything that isn't plain ISO
+    try:
+        parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+class RateLimiter:
+    """
+    Wall-clock rate limiter for the page loop
+
+    Unlike a fixed sleep after every response, this only sleeps for the
+    remainder of the interval, so time spent parsing a response counts as
+    credit and fast responses aren't penalized with a full extra sleep
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._next_request = 0.0
+
+    def wait(self):
+        """Block until the next request slot is available"""
+        now = time.monotonic()
+        if now < self._next_request:
+            time.sleep(self._next_request - now)
+            now = time.monotonic()
+        self._next_request = now + self.interval
+
+
+_LIMITER = RateLimiter(REQUEST_INTERVAL)
+
+# Persistent session: HTTP keep-alive reuses the TCP+TLS connection across
+# all page requests, and the retry adapter handles 429/5xx with backoff
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
 if not API_KEY:
     raise ValueError("CRYPTOPANIC_API_KEY not found in environment variables. Please create a .env file with your API key.")
 
@@ -61,22 +130,31 @@ def fetch_cryptopanic_data(start_date, end_date, currencies, api_key):
         }
         
         try:
-            print(f"\n[DEBUG] Request URL: {BASE_URL}")
-            print(f"[DEBUG] Request params: {dict((k, v if k != 'auth_token' else '***') for k, v in params.items())}")
-            
-            response = requests.get(BASE_URL, params=params, timeout=30)
-            
-            print(f"[DEBUG] Response status code: {response.status_code}")
+            logger.debug("Request URL: %s", BASE_URL)
+            logger.debug("Request params: %s",
+                         dict((k, v if k != 'auth_token' else '***') for k, v in params.items()))
             
+            # Schedule against the wall clock instead of sleeping after the response
+            _LIMITER.wait()
+            response = SESSION.get(BASE_URL, params=params, timeout=30, stream=True)
+
+            logger.debug("Response status code: %s", response.status_code)
+
             # Check if response is successful
             if response.status_code != 200:
-                print(f"[DEBUG] Response text: {response.text[:500]}")
+                logger.debug("Response text: %.500s", response.text)
                 response.raise_for_status()
+
+            # Stream-parse the JSON body in one pass over the raw socket,
+            # capturing top-level keys ('results', 'next', ...) without
+            # materializing the response text first
+            response.raw.decode_content = True
+            # use_float keeps JSON numbers as floats instead of ijson's
+            # Decimal default, which orjson refuses to serialize on export
+            data = dict(ijson.kvitems(response.raw, '', use_float=True))
             
-            data = response.json()
-            
-            print(f"[DEBUG] Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-            print(f"[DEBUG] Full response (first 500 chars): {str(data)[:500]}")
+            logger.debug("Response keys: %s", list(data.keys()) if isinstance(data, dict) else 'Not a dict')
+            logger.debug("Full response (first 500 chars): %.500s", data)
             
             # Check different possible response formats
             posts = []
@@ -87,106 +165,55 @@ def fetch_cryptopanic_data(start_date, end_date, currencies, api_key):
             elif 'data' in data:
                 posts = data['data']
             
-            print(f"[DEBUG] Found {len(posts)} posts in response")
+            logger.debug("Found %d posts in response", len(posts))
             
             if len(posts) == 0:
                 print(f"No more results at page {page}")
                 if page == 1:
-                    print("[DEBUG] First page returned no results. Check API key and parameters.")
+                    logger.debug("First page returned no results. Check API key and parameters.")
                 break
             
-            # Filter posts by date range
-            filtered_posts = []
-            for i, post in enumerate(posts):
-                # Try different date field names (prefer published_at)
-                post_date_str = post.get('published_at') or post.get('created_at') or post.get('date')
-                
-                if post_date_str:
-                    try:
-                        # Handle ISO format dates (e.g., "2025-11-21T04:37:40Z" or "2025-11-21T04:37:40+00:00")
-                        if isinstance(post_date_str, str):
-                            # Parse ISO format with timezone
-                            if post_date_str.endswith('Z'):
-                                # Replace Z with +00:00 for fromisoformat
-                                post_date_str_clean = post_date_str.replace('Z', '+00:00')
-                            else:
-                                post_date_str_clean = post_date_str
-                            
-                            try:
-                                post_date = datetime.fromisoformat(post_date_str_clean)
-                            except ValueError:
-                                # Try without timezone
-                                post_date_str_clean = post_date_str.replace('Z', '').replace('+00:00', '')
-                                try:
-                                    post_date = datetime.fromisoformat(post_date_str_clean)
-                                except:
-                                    # Try other formats
-                                    for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
-                                        try:
-                                            post_date = datetime.strptime(post_date_str_clean[:19], fmt)
-                                            break
-                                        except:
-                                            continue
-                                    else:
-                                        raise ValueError(f"Could not parse date: {post_date_str}")
-                            
-                            # Convert to naive datetime for comparison
-                            if post_date.tzinfo is not None:
-                                post_date_naive = post_date.replace(tzinfo=None)
-                            else:
-                                post_date_naive = post_date
-                            
-                            # Debug first few posts
-                            if i < 3:
-                                print(f"[DEBUG] Post {i+1}: date={post_date_naive}, title={post.get('title', '')[:50]}")
-                            
-                            # Check if date is in range
-                            if start_dt <= post_date_naive <= end_dt:
-                                filtered_posts.append(post)
-                            elif post_date_naive < start_dt:
-                                # If we've gone past the start date, we can stop
-                                print(f"Reached posts before start date ({post_date_naive}). Stopping at page {page}")
-                                return all_posts
-                            # If post_date_naive > end_dt, we continue (might be sorting issue)
-                        else:
-                            # If date is not a string, skip for now
-                            if i < 3:
-                                print(f"[DEBUG] Post {i+1} has non-string date: {post_date_str} (type: {type(post_date_str)})")
-                    except Exception as e:
-                        if i < 3:
-                            print(f"[DEBUG] Error parsing date {post_date_str}: {e}")
-                else:
-                    # If no date field, skip
-                    if i < 3:
-                        print(f"[DEBUG] Post {i+1} has no date field. Keys: {list(post.keys())}")
-            
+            # Cheap early exit before any DataFrame work: posts come back
+            # newest-first, so if the newest post on the page already
+            # predates the start date, this page and every later one is too old
+            first_post = posts[0]
+            first_date = _parse_post_date(
+                first_post.get('published_at') or first_post.get('created_at') or first_post.get('date')
+            )
+            if first_date is not None and first_date < start_dt:
+                print(f"All posts on page {page} are before start date. Stopping.")
+                break
+
+            # Filter posts by date range in one vectorized pass: a single
+            # pd.to_datetime over the page replaces a try/except parse per post
+            posts_df = pd.DataFrame(posts)
+            for field in ('published_at', 'created_at', 'date'):
+                if field not in posts_df.columns:
+                    posts_df[field] = None
+            # Try different date field names (prefer published_at); empty
+            # strings count as missing so they fall through to the next
+            # field like the old falsy-or chain did
+            date_cols = posts_df[['published_at', 'created_at', 'date']].replace('', None)
+            raw_dates = date_cols['published_at'].fillna(date_cols['created_at']).fillna(date_cols['date'])
+            # format='ISO8601' parses full timestamps and bare dates alike
+            # without inferring one layout from the first row of the page
+            post_dates = pd.to_datetime(raw_dates, format='ISO8601', utc=True,
+                                        errors='coerce').dt.tz_localize(None)
+
+            # Keep posts inside the requested range (unparseable dates drop out
+            # as NaT); posts after end_dt are ignored but don't stop the scan
+            mask = (post_dates >= start_dt) & (post_dates <= end_dt)
+            filtered_posts = [posts[i] for i in np.flatnonzero(mask.to_numpy())]
+
             all_posts.extend(filtered_posts)
             print(f"Page {page}: Found {len(filtered_posts)} posts in date range (Total: {len(all_posts)})")
-            
-            # Check if we've gone too far back (all posts are before start date)
-            if len(filtered_posts) == 0 and len(posts) > 0:
-                # Check if all posts in this page are before start date
-                all_before_start = True
-                for post in posts:
-                    post_date_str = post.get('published_at') or post.get('created_at')
-                    if post_date_str:
-                        try:
-                            if post_date_str.endswith('Z'):
-                                post_date_str_clean = post_date_str.replace('Z', '+00:00')
-                            else:
-                                post_date_str_clean = post_date_str
-                            post_date = datetime.fromisoformat(post_date_str_clean)
-                            if post_date.tzinfo:
-                                post_date = post_date.replace(tzinfo=None)
-                            if post_date >= start_dt:
-                                all_before_start = False
-                                break
-                        except:
-                            pass
-                
-                if all_before_start:
-                    print(f"All posts on page {page} are before start date. Stopping.")
-                    break
+
+            # Posts come back newest-first, so once every parseable date on
+            # the page is before the start date there is nothing older to find
+            parseable = post_dates.notna()
+            if parseable.any() and (post_dates[parseable] < start_dt).all():
+                print(f"All posts on page {page} are before start date. Stopping.")
+                break
             
             # Check if we have next page
             # Note: CryptoPanic API may return null for next even if more pages exist
@@ -223,10 +250,7 @@ def fetch_cryptopanic_data(start_date, end_date, currencies, api_key):
             if page > 50:
                 print(f"Reached page limit (50). Stopping.")
                 break
-            
-            # Rate limiting - be respectful to the API
-            time.sleep(0.5)
-            
+
         except requests.exceptions.RequestException as e:
             print(f"Error fetching data from API: {e}")
             break
@@ -249,35 +273,61 @@ def process_and_export_data(posts, output_file='cryptopanic_data.json'):
         print("No posts to export")
         return
     
-    # Export raw JSON
+    # Export raw JSON (orjson writes UTF-8 bytes directly, several times
+    # faster than the stdlib encoder and without an intermediate str)
     json_file = output_file
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
+    with open(json_file, 'wb') as f:
+        f.write(orjson.dumps(posts, option=orjson.OPT_INDENT_2))
     print(f"\nExported {len(posts)} posts to {json_file}")
     
-    # Process into DataFrame for CSV export
-    processed_data = []
-    for post in posts:
-        processed_data.append({
-            'id': post.get('id'),
-            'title': post.get('title'),
-            'url': post.get('url'),
-            'published_at': post.get('created_at'),
-            'source': post.get('source', {}).get('title', ''),
-            'votes': post.get('votes', {}).get('positive', 0) - post.get('votes', {}).get('negative', 0),
-            'positive_votes': post.get('votes', {}).get('positive', 0),
-            'negative_votes': post.get('votes', {}).get('negative', 0),
-            'comments_count': post.get('comments_count', 0),
-            'currencies': ', '.join([c.get('code', '') for c in post.get('currencies', [])]),
-            'kind': post.get('kind', '')
-        })
-    
-    df = pd.DataFrame(processed_data)
+    # Flatten the nested post structure (source, votes) in one
+    # pd.json_normalize pass instead of building a dict per post in Python
+    flat = pd.json_normalize(posts, max_level=1)
+    for col in ('id', 'title', 'url', 'created_at', 'kind', 'comments_count',
+                'source.title', 'votes.positive', 'votes.negative'):
+        if col not in flat.columns:
+            flat[col] = None
+
+    # The currencies list stays a Python comprehension (variable-length nested list)
+    currencies = [
+        ', '.join(c.get('code', '') for c in (post.get('currencies') or []))
+        for post in posts
+    ]
+
+    df = pd.DataFrame({
+        'id': flat['id'],
+        'title': flat['title'],
+        'url': flat['url'],
+        'published_at': flat['created_at'],
+        'source': flat['source.title'].fillna(''),
+        'votes': flat['votes.positive'].fillna(0).astype(int) - flat['votes.negative'].fillna(0).astype(int),
+        'positive_votes': flat['votes.positive'].fillna(0).astype(int),
+        'negative_votes': flat['votes.negative'].fillna(0).astype(int),
+        'comments_count': flat['comments_count'].fillna(0).astype(int),
+        'currencies': currencies,
+        'kind': flat['kind'].fillna(''),
+    })
     
+    # Drop posts that pagination returned twice (the feed shifts underneath
+    # the page loop while fetching). Hashing the url column and running
+    # numpy's integer unique is O(N) with 64-bit comparisons instead of the
+    # Python-string sort drop_duplicates would do; the duplicated() pass
+    # afterwards guards against hash collisions on the already-small frame
+    url_hashes = pd.util.hash_array(df['url'].to_numpy())
+    _, idx = np.unique(url_hashes, return_index=True)
+    df = df.iloc[np.sort(idx)]
+    df = df[~df.duplicated('url')].reset_index(drop=True)
+
     # Export to CSV
     csv_file = output_file.replace('.json', '.csv')
     df.to_csv(csv_file, index=False, encoding='utf-8')
     print(f"Exported processed data to {csv_file}")
+
+    # Export to Parquet (columnar + zstd: smaller on disk and much faster
+    # for downstream pandas readers than re-tokenizing the CSV)
+    parquet_file = output_file.replace('.json', '.parquet')
+    df.to_parquet(parquet_file, engine='pyarrow', compression='zstd', index=False)
+    print(f"Exported processed data to {parquet_file}")
     
     # Print summary statistics
     print(f"\n=== Data Summary ===")
@@ -298,6 +348,9 @@ def main():
     currencies = 'BTC,ETH'
     output_file = 'cryptopanic_data.json'
     
+    # Debug detail stays off by default; flip to DEBUG to trace each request
+    logging.basicConfig(level=logging.INFO)
+    
     print("=" * 60)
     print("CryptoPanic Data Fetcher")
     print("=" * 60)
@@ -6,13 +6,20 @@ Keywords: bitcoin, btc, ethereum, eth, cryptocurrency, crypto, blockchain, digit
 """
 
 import os
-import requests
-import json
+import asyncio
 import pandas as pd
-from datetime import datetime, timedelta
-import time
+from collections import Counter
+from datetime import datetime
 import re
-from urllib.parse import quote
+from urllib.parse import urlencode
+
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+import msgspec
+import pyarrow as pa
+import pyarrow.parquet as pq
+from aiolimiter import AsyncLimiter
 
 # GDELT API configuration
 BASE_URL = 'https://api.gdeltproject.org/api/v2/doc/doc'
@@ -30,6 +37,27 @@ END_DATE = '2025-11-01'
 # Maximum records per request (GDELT limit is usually 250)
 MAX_RECORDS_PER_REQUEST = 250
 
+# Compiled once at import: a single fused pattern replaces one keyword search
+# plus one search per exclusion pattern. The leading lookahead requires at
+# least one keyword; the negative lookaheads reject the non-crypto contexts
+# (energy/mining articles that merely mention bitcoin).
+_COMBINED_RE = re.compile(
+    r'(?=.*\b(?:bitcoin|btc|ethereum|eth|cryptocurrency|crypto|blockchain|digital\s+currency)\b)'
+    r'(?!.*\b(?:energy|power|electricity|mining)\s+(?:bitcoin|btc)\b)'
+    r'(?!.*\b(?:bitcoin|btc)\s+(?:mining|energy))',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Maximum number of chunk requests in flight at once (stay polite to the API)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Global rate limit: 5 requests per second across all concurrent fetches
+REQUESTS_PER_SECOND = 5
+
+# Stop issuing requests after this many empty chunks in a row (dead ranges,
+# e.g. future-dated months, are not worth the remaining round trips)
+MAX_CONSECUTIVE_EMPTY = 3
+
 
 def build_query_string(keywords):
     """Build OR query string for GDELT API (must be wrapped in parentheses)"""
@@ -37,124 +65,256 @@ def build_query_string(keywords):
     return f'({query})'
 
 
+# Query string for the default keyword set, built once at import
+_QUERY = build_query_string(KEYWORDS)
+
+
+class Article(msgspec.Struct, gc=False):
+    """Typed GDELT article; msgspec decodes responses straight into these"""
+    title: str = ''
+    url: str = ''
+    seendate: str = ''
+    domain: str = ''
+    source: str = ''
+    snippet: str = ''
+    language: str = 'unknown'
+
+
+class GdeltResponse(msgspec.Struct, gc=False):
+    """Top-level GDELT artlist response: {"articles": [...]}"""
+    articles: list[Article] = msgspec.field(default_factory=list)
+
+
+# Reusable decoder (compiled once; ~5-10x faster than json.loads and no
+# GC-tracked dicts per article)
+_RESPONSE_DECODER = msgspec.json.Decoder(GdeltResponse)
+
+
 def format_datetime_for_gdelt(date_str):
     """Convert date string (YYYY-MM-DD) to GDELT format (YYYYMMDDHHMMSS)"""
     dt = datetime.strptime(date_str, '%Y-%m-%d')
     return dt.strftime('%Y%m%d000000')
 
 
-def fetch_gdelt_data(start_date, end_date, keywords, max_records=5000):
+async def fetch_chunk(session, semaphore, limiter, pool, chunk_info, keywords, base_params, seen_urls, abort):
+    """
+    Fetch and filter a single monthly chunk from the GDELT API
+
+    Args:
+        session: Shared aiohttp.ClientSession
+        semaphore: asyncio.Semaphore bounding concurrent requests
+        limiter: AsyncLimiter enforcing the global request rate
+        pool: ProcessPoolExecutor running the CPU-bound regex filtering
+        chunk_info: Tuple of (chunk_number, total_chunks, range_start,
+            range_end, start_datetime, end_datetime)
+        keywords: List of keywords to check for
+        base_params: URL-encoded invariant query params (query/mode/etc.)
+        seen_urls: Shared set of URLs already fetched in other chunks
+        abort: asyncio.Event set once the empty-chunk streak fires
+
+    Returns:
+        Tuple of (articles fetched, filtered article list) on success, or
+        None when the chunk was skipped or its fetch failed — callers use
+        the distinction to keep transient errors out of the empty streak
+    """
+    chunk_number, total_chunks, range_start, range_end, start_datetime, end_datetime = chunk_info
+
+    # Only the datetime window varies per chunk; the rest of the query
+    # string was URL-encoded once up front
+    url = f"{BASE_URL}?{base_params}&startdatetime={start_datetime}&enddatetime={end_datetime}"
+
+    try:
+        # Bound concurrency and request rate before hitting the API
+        async with semaphore:
+            # Re-check after waiting on the semaphore: the abort may have
+            # fired while this chunk was queued, in which case skip the RTT
+            if abort.is_set():
+                print(f"Skipping chunk {chunk_number}/{total_chunks}: empty-chunk abort")
+                return None
+
+            body = None
+            for attempt in range(2):
+                async with limiter:
+                    # Re-check after the limiter wait as well: the semaphore
+                    # clears quickly, so most queued chunks are sitting here
+                    # when the streak fires
+                    if abort.is_set():
+                        print(f"Skipping chunk {chunk_number}/{total_chunks}: empty-chunk abort")
+                        return None
+                    print(f"Fetching chunk {chunk_number}/{total_chunks}: {range_start} to {range_end}")
+                    async with session.get(url) as response:
+                        if response.status == 429 and attempt == 0:
+                            # Honour the server's pacing hint before the
+                            # single retry (minimum 2s if none was sent)
+                            delay = max(float(response.headers.get('Retry-After', 1)), 2.0)
+                            print(f"  Chunk {chunk_number}: HTTP 429, retrying in {delay:.0f}s")
+                            await asyncio.sleep(delay)
+                            continue
+                        if response.status != 200:
+                            body = await response.text()
+                            print(f"  Error: HTTP {response.status}")
+                            print(f"  Response: {body[:200]}")
+                            return None
+
+                        # GDELT returns data in format: {"articles": [...]}
+                        body = await response.read()
+                        break
+
+        # Decode the bytes straight into typed Article structs: no
+        # intermediate str copy and no GC-tracked dict per article
+        try:
+            articles = _RESPONSE_DECODER.decode(body).articles
+        except msgspec.DecodeError as e:
+            print(f"  Error parsing JSON: {e}")
+            return None
+
+        print(f"  Chunk {chunk_number}: fetched {len(articles)} articles")
+
+        # Drop URLs already seen in other chunks before doing any regex work;
+        # the O(1) set lookup replaces the old DataFrame-wide drop_duplicates
+        unique_articles = []
+        for article in articles:
+            url = article.url
+            if url:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+            unique_articles.append(article)
+
+        # Filter articles to ensure they're relevant. The regex work is pure
+        # CPU, so it runs in a worker process and overlaps with the network
+        # I/O of the other chunks instead of blocking the event loop
+        loop = asyncio.get_running_loop()
+        filtered_articles = await loop.run_in_executor(
+            pool, filter_relevant_articles, unique_articles, keywords
+        )
+        print(f"  Chunk {chunk_number}: after filtering: {len(filtered_articles)} relevant articles")
+
+        return len(articles), filtered_articles
+
+    except aiohttp.ClientError as e:
+        print(f"  Error fetching chunk {chunk_number}: {e}")
+        return None
+    except asyncio.TimeoutError:
+        print(f"  Timeout fetching chunk {chunk_number}")
+        return None
+    except Exception as e:
+        print(f"  Unexpected error in chunk {chunk_number}: {e}")
+        return None
+
+
+async def fetch_gdelt_data(start_date, end_date, keywords, exporter, max_records=5000):
     """
     Fetch data from GDELT API
-    Splits large date ranges into monthly chunks to avoid API limits
-    
+    Splits large date ranges into monthly chunks and fetches them concurrently
+    with aiohttp (bounded by a semaphore and a global rate limiter).
+    Each chunk is handed to the exporter as soon as it completes, so memory
+    stays bounded by the chunk size.
+
     Args:
         start_date: Start date in format 'YYYY-MM-DD'
         end_date: End date in format 'YYYY-MM-DD'
         keywords: List of keywords to search for
+        exporter: ChunkExporter that receives each completed chunk
         max_records: Maximum number of records to fetch
-    
+
     Returns:
-        List of articles
+        Tuple of (total articles exported, chunks not fetched); the second
+        count covers failed fetches and chunks skipped by the empty-streak
+        abort, so callers can report incomplete runs
     """
-    all_articles = []
-    query = build_query_string(keywords)
-    
+    total_articles = 0
+    # Reuse the precompiled query for the default keyword set
+    query = _QUERY if keywords == KEYWORDS else build_query_string(keywords)
+
+    # URL-encode the invariant params once instead of re-encoding the long
+    # OR-query string on every request
+    base_params = urlencode({
+        'query': query,
+        'mode': 'artlist',
+        'maxrecords': MAX_RECORDS_PER_REQUEST,
+        'format': 'json',
+    })
+
     print(f"Fetching GDELT data from {start_date} to {end_date}")
     print(f"Keywords: {', '.join(keywords)}")
     print(f"Query: {query}")
     print()
-    
+
     # Split date range into monthly chunks to avoid API limits
     start_dt = datetime.strptime(start_date, '%Y-%m-%d')
     end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-    
-    # Generate monthly date ranges
-    date_ranges = []
-    current = start_dt
-    while current < end_dt:
-        # Calculate end of current month or end_date, whichever is earlier
-        if current.month == 12:
-            next_month = current.replace(year=current.year + 1, month=1, day=1)
-        else:
-            next_month = current.replace(month=current.month + 1, day=1)
-        
-        range_end = min(next_month - timedelta(days=1), end_dt)
-        date_ranges.append((
-            current.strftime('%Y-%m-%d'),
-            range_end.strftime('%Y-%m-%d')
-        ))
-        current = next_month
-    
+
+    # Generate monthly date ranges with pandas: month starts from date_range,
+    # month ends via MonthEnd, clipped to end_dt (no manual year-boundary math)
+    starts = pd.date_range(start_dt, end_dt, freq='MS', inclusive='left')
+    if start_dt < end_dt and (len(starts) == 0 or starts[0] != start_dt):
+        # Keep the partial first month when start_date isn't the 1st
+        starts = starts.insert(0, pd.Timestamp(start_dt))
+    ends = starts + pd.offsets.MonthEnd(0)
+    ends = ends.where(ends <= end_dt, pd.Timestamp(end_dt))
+    date_ranges = list(zip(starts.strftime('%Y-%m-%d'), ends.strftime('%Y-%m-%d')))
+
     print(f"Split into {len(date_ranges)} monthly chunks")
     print()
-    
-    # Fetch data for each date range
-    for i, (range_start, range_end) in enumerate(date_ranges, 1):
-        print(f"Fetching chunk {i}/{len(date_ranges)}: {range_start} to {range_end}")
-        
-        # Format dates for GDELT API
-        start_datetime = format_datetime_for_gdelt(range_start)
-        end_datetime = format_datetime_for_gdelt(range_end)
-        
-        # GDELT API parameters
-        params = {
-            'query': query,
-            'mode': 'artlist',
-            'maxrecords': MAX_RECORDS_PER_REQUEST,
-            'format': 'json',
-            'startdatetime': start_datetime,
-            'enddatetime': end_datetime
-        }
-        
-        try:
-            response = requests.get(BASE_URL, params=params, timeout=60)
-            
-            if response.status_code != 200:
-                print(f"  Error: HTTP {response.status_code}")
-                print(f"  Response: {response.text[:200]}")
-                continue
-            
-            # GDELT API returns JSON with 'articles' key
-            content = response.text.strip()
-            
-            # Parse JSON
-            try:
-                data = json.loads(content)
-                
-                # GDELT returns data in format: {"articles": [...]}
-                if isinstance(data, dict) and 'articles' in data:
-                    articles = data['articles']
-                elif isinstance(data, list):
-                    articles = data
+
+    # Format the GDELT datetime strings for every chunk up front so the
+    # dispatch below does no per-chunk string work
+    chunks = [
+        (range_start, range_end,
+         format_datetime_for_gdelt(range_start), format_datetime_for_gdelt(range_end))
+        for range_start, range_end in date_ranges
+    ]
+
+    # Fetch all chunks concurrently (network I/O overlaps across chunks)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limiter = AsyncLimiter(REQUESTS_PER_SECOND, 1)
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_REQUESTS, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=60)
+    seen_urls = set()
+    abort = asyncio.Event()
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            tasks = [
+                fetch_chunk(
+                    session, semaphore, limiter, pool,
+                    (i, len(chunks), range_start, range_end, start_datetime, end_datetime),
+                    keywords, base_params, seen_urls, abort
+                )
+                for i, (range_start, range_end, start_datetime, end_datetime) in enumerate(chunks, 1)
+            ]
+
+            # Write each chunk as soon as it completes instead of gathering
+            # everything first; only one chunk is resident at a time. Track
+            # the empty streak in completion order and flip the abort event
+            # so still-queued chunks stop before issuing their request.
+            # Only genuine zero-article responses count toward the streak:
+            # failed or skipped chunks (None) must not trigger the abort,
+            # and a fetched chunk resets it even if filtering drops it all
+            consecutive_empty = 0
+            missing_chunks = 0
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                if result is None:
+                    missing_chunks += 1
+                    continue
+                fetched_count, filtered_articles = result
+                if fetched_count:
+                    consecutive_empty = 0
                 else:
-                    print(f"  Unexpected response format")
-                    articles = []
-                    
-            except json.JSONDecodeError as e:
-                print(f"  Error parsing JSON: {e}")
-                continue
-            
-            print(f"  Fetched {len(articles)} articles")
-            
-            # Filter articles to ensure they're relevant
-            filtered_articles = filter_relevant_articles(articles, keywords)
-            print(f"  After filtering: {len(filtered_articles)} relevant articles")
-            
-            all_articles.extend(filtered_articles)
-            
-            # Rate limiting
-            time.sleep(1)
-            
-        except requests.exceptions.RequestException as e:
-            print(f"  Error fetching data: {e}")
-            continue
-        except Exception as e:
-            print(f"  Unexpected error: {e}")
-            continue
-    
-    print(f"\nTotal articles fetched: {len(all_articles)}")
-    return all_articles
+                    consecutive_empty += 1
+                    if consecutive_empty >= MAX_CONSECUTIVE_EMPTY and not abort.is_set():
+                        print(f"\n{consecutive_empty} consecutive empty chunks; "
+                              f"skipping the remaining requests")
+                        abort.set()
+                exporter.write_chunk(filtered_articles)
+                total_articles += len(filtered_articles)
+
+    print(f"\nTotal articles fetched: {total_articles}")
+    if missing_chunks:
+        print(f"Chunks not fetched (errors or early exit): {missing_chunks}/{len(chunks)}")
+    return total_articles, missing_chunks
 
 
 def filter_relevant_articles(articles, keywords):
@@ -163,112 +323,150 @@ def filter_relevant_articles(articles, keywords):
     Remove articles that are clearly not about cryptocurrency
     
     Args:
-        articles: List of article dictionaries
+        articles: List of Article structs
         keywords: List of keywords to check for
     
     Returns:
         Filtered list of articles
     """
     filtered = []
-    keyword_pattern = re.compile(
-        r'\b(bitcoin|btc|ethereum|eth|cryptocurrency|crypto|blockchain|digital\s+currency)\b',
-        re.IGNORECASE
-    )
-    
-    # Patterns to exclude (articles that mention keywords but are not about crypto)
-    exclude_patterns = [
-        r'\b(energy|power|electricity|mining)\s+(bitcoin|btc)\b',  # Energy mining, not crypto
-        r'\b(bitcoin|btc)\s+(mining|energy)',  # Bitcoin energy/mining (non-crypto context)
-    ]
-    exclude_compiled = [re.compile(pattern, re.IGNORECASE) for pattern in exclude_patterns]
-    
     for article in articles:
-        # Get article text
-        title = article.get('title', '') or ''
-        snippet = article.get('snippet', '') or ''
-        url = article.get('url', '') or ''
-        text = f"{title} {snippet} {url}".lower()
-        
-        # Must contain at least one keyword
-        if not keyword_pattern.search(text):
-            continue
-        
-        # Exclude if matches exclusion patterns
-        should_exclude = False
-        for exclude_pattern in exclude_compiled:
-            if exclude_pattern.search(text):
-                should_exclude = True
-                break
-        
-        if not should_exclude:
+        # No .lower() here: _COMBINED_RE is compiled with re.IGNORECASE, so
+        # lowercasing the joined text would just be an extra allocation and
+        # a second linear scan per article
+        text = f"{article.title} {article.snippet} {article.url}"
+
+        # Single pass: keyword required, exclusion contexts rejected
+        if _COMBINED_RE.match(text):
             filtered.append(article)
-    
+
     return filtered
 
 
-def process_and_export_data(articles, output_file='gdelt_data.json'):
+def process_articles(articles):
     """
-    Process articles and export to JSON and CSV files
-    
+    Process a list of articles into a DataFrame with standard columns
+
     Args:
-        articles: List of article dictionaries
-        output_file: Base name for output files
+        articles: List of Article structs
+
+    Returns:
+        DataFrame with title/url/published_at/seendate/source/snippet/language
     """
-    if not articles:
-        print("No articles to export")
-        return
-    
-    # Export raw JSON
-    json_file = output_file
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
-    print(f"\nExported {len(articles)} articles to {json_file}")
-    
-    # Process into DataFrame for CSV export
-    processed_data = []
+    # Append into per-column lists (columnar layout) so the DataFrame
+    # constructor gets ready-made columns instead of transposing a
+    # list of per-row dicts
+    titles, urls, seendates, sources, snippets, languages = [], [], [], [], [], []
     for article in articles:
-        # GDELT article structure
-        # Parse seendate format: 20241109T164500Z
-        seendate = article.get('seendate', '')
-        formatted_date = ''
-        if seendate:
-            try:
-                # Parse GDELT date format: YYYYMMDDTHHMMSSZ
-                dt = datetime.strptime(seendate, '%Y%m%dT%H%M%SZ')
-                formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-            except:
-                formatted_date = seendate
-        
-        processed_data.append({
-            'title': article.get('title', ''),
-            'url': article.get('url', ''),
-            'published_at': formatted_date,
-            'seendate': seendate,
-            'source': article.get('domain', '') or article.get('source', ''),
-            'snippet': article.get('snippet', ''),
-            'language': article.get('language', 'unknown'),
-        })
-    
-    df = pd.DataFrame(processed_data)
-    
-    # Remove duplicates based on URL
-    df = df.drop_duplicates(subset=['url'], keep='first')
-    
-    # Export to CSV
-    csv_file = output_file.replace('.json', '.csv')
-    df.to_csv(csv_file, index=False, encoding='utf-8')
-    print(f"Exported processed data to {csv_file} (after removing duplicates: {len(df)} articles)")
-    
-    # Print summary statistics
-    print(f"\n=== Data Summary ===")
-    print(f"Total articles: {len(articles)}")
-    print(f"Unique articles: {len(df)}")
-    if 'published_at' in df.columns and len(df) > 0:
-        dates = df['published_at'].dropna()
+        # GDELT article structure (attribute access on the typed structs)
+        titles.append(article.title)
+        urls.append(article.url)
+        seendates.append(article.seendate)
+        sources.append(article.domain or article.source)
+        snippets.append(article.snippet)
+        languages.append(article.language)
+
+    df = pd.DataFrame({
+        'title': titles,
+        'url': urls,
+        'seendate': seendates,
+        'source': sources,
+        'snippet': snippets,
+        'language': languages,
+    })
+
+    # Parse all seendates in one vectorized pass (GDELT format: 20241109T164500Z);
+    # the explicit format= skips pandas' per-value format inference, and
+    # unparseable values fall back to the raw string as before
+    parsed = pd.to_datetime(df['seendate'], format='%Y%m%dT%H%M%SZ', errors='coerce', utc=True)
+    df['published_at'] = parsed.dt.strftime('%Y-%m-%d %H:%M:%S').fillna(df['seendate'])
+    df = df[['title', 'url', 'published_at', 'seendate', 'source', 'snippet', 'language']]
+
+    # Duplicates are already removed during fetching (seen_urls set)
+    return df
+
+
+class ChunkExporter:
+    """
+    Incrementally export chunks of articles to JSON, CSV and Parquet
+
+    Each chunk is processed and appended to the output files as soon as it
+    arrives, so peak memory stays at one chunk's worth of articles instead
+    of the whole date range
+    """
+
+    def __init__(self, output_file='gdelt_data.json'):
+        self.json_file = output_file
+        self.csv_file = output_file.replace('.json', '.csv')
+        self.parquet_file = output_file.replace('.json', '.parquet')
+        self._json_f = None
+        self._parquet_writer = None
+        self._articles_written = 0
+        self._sources = set()
+        self._languages = Counter()
+        self._date_min = None
+        self._date_max = None
+
+    def write_chunk(self, articles):
+        """Process one chunk of articles and append it to all output files"""
+        if not articles:
+            return
+
+        df = process_articles(articles)
+
+        # Raw JSON: stream the array out one article per line
+        if self._json_f is None:
+            self._json_f = open(self.json_file, 'wb')
+            self._json_f.write(b'[\n')
+        else:
+            self._json_f.write(b',\n')
+        self._json_f.write(b',\n'.join(msgspec.json.encode(article) for article in articles))
+
+        # CSV: write the header with the first chunk, then append
+        df.to_csv(self.csv_file, mode='a' if self._articles_written else 'w',
+                  header=not self._articles_written, index=False, encoding='utf-8')
+
+        # Parquet: one row group per chunk through a shared writer
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.parquet_file, table.schema, compression='zstd')
+        self._parquet_writer.write_table(table)
+
+        # Track summary statistics incrementally
+        self._articles_written += len(df)
+        self._sources.update(df['source'])
+        self._languages.update(df['language'])
+        dates = df['published_at'][df['published_at'] != '']
         if len(dates) > 0:
-            print(f"Date range: {dates.min()} to {dates.max()}")
-    print(f"Unique sources: {df['source'].nunique()}")
-    print(f"Languages: {df['language'].value_counts().to_dict()}")
+            chunk_min, chunk_max = dates.min(), dates.max()
+            if self._date_min is None or chunk_min < self._date_min:
+                self._date_min = chunk_min
+            if self._date_max is None or chunk_max > self._date_max:
+                self._date_max = chunk_max
+
+    def close(self):
+        """Close the output files and print summary statistics"""
+        if self._json_f is not None:
+            self._json_f.write(b'\n]\n')
+            self._json_f.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+        if self._articles_written == 0:
+            print("No articles to export")
+            return
+
+        print(f"\nExported {self._articles_written} articles to {self.json_file}")
+        print(f"Exported processed data to {self.csv_file}")
+        print(f"Exported processed data to {self.parquet_file}")
+
+        # Print summary statistics
+        print(f"\n=== Data Summary ===")
+        print(f"Total articles: {self._articles_written}")
+        if self._date_min is not None:
+            print(f"Date range: {self._date_min} to {self._date_max}")
+        print(f"Unique sources: {len(self._sources)}")
+        print(f"Languages: {dict(self._languages)}")
 
 
 def main():
@@ -279,12 +477,18 @@ def main():
     print("=" * 60)
     print()
     
-    # Fetch data
-    articles = fetch_gdelt_data(START_DATE, END_DATE, KEYWORDS, max_records=5000)
-    
-    if articles:
-        # Export data
-        process_and_export_data(articles, 'gdelt_data.json')
+    # Fetch data (concurrent chunk fetches run inside the event loop);
+    # chunks are exported incrementally as they complete
+    exporter = ChunkExporter('gdelt_data.json')
+    total_articles, missing_chunks = asyncio.run(
+        fetch_gdelt_data(START_DATE, END_DATE, KEYWORDS, exporter, max_records=5000)
+    )
+    exporter.close()
+
+    if total_articles and missing_chunks:
+        print(f"\n[WARNING] Export completed, but {missing_chunks} chunks were "
+              f"not fetched (errors or early exit). The output may be incomplete.")
+    elif total_articles:
         print("\n[SUCCESS] Data fetching and export completed successfully!")
     else:
         print("\n[ERROR] No articles were fetched.")
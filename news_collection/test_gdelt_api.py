@@ -2,11 +2,25 @@
 測試 GDELT API 連接和響應格式
 """
 
+import io
+
 import requests
-import json
+import orjson
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = 'https://api.gdeltproject.org/api/v2/doc/doc'
 
+# Shared session: keeps the TCP+TLS connection alive across probes and
+# retries transient failures with backoff instead of dying on the first one
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+
 # Test query (GDELT requires OR queries to be wrapped in parentheses)
 keywords = ["bitcoin", "btc", "ethereum", "eth"]
 query = f"({' OR '.join(keywords)})"
@@ -27,7 +41,7 @@ print(f"Date range: 2024-11-01 to 2024-11-10")
 print()
 
 try:
-    response = requests.get(BASE_URL, params=params, timeout=30)
+    response = SESSION.get(BASE_URL, params=params, timeout=30)
     print(f"Status code: {response.status_code}")
     print(f"Content-Type: {response.headers.get('Content-Type', 'unknown')}")
     print()
@@ -39,31 +53,29 @@ try:
         print(content[:500])
         print()
         
-        # Try to parse
+        # Try to parse the whole payload with orjson first (C parser);
+        # only fall back to JSON Lines if that fails
         try:
-            if content.startswith('['):
-                data = json.loads(content)
+            data = orjson.loads(content)
+            if isinstance(data, list):
                 print(f"Parsed as JSON array: {len(data)} items")
                 if len(data) > 0:
                     print(f"\nFirst item structure:")
-                    print(json.dumps(data[0], indent=2, ensure_ascii=False)[:1000])
-            elif content.startswith('{'):
-                data = json.loads(content)
+                    print(orjson.dumps(data[0], option=orjson.OPT_INDENT_2).decode()[:1000])
+            else:
                 print(f"Parsed as JSON object")
                 print(f"Keys: {list(data.keys())}")
-            else:
-                # Try JSON Lines
-                lines = content.split('\n')
-                print(f"Trying JSON Lines format: {len(lines)} lines")
-                if len(lines) > 0:
-                    try:
-                        first_item = json.loads(lines[0])
-                        print(f"First line parsed successfully")
-                        print(f"Keys: {list(first_item.keys())}")
-                    except:
-                        print("Could not parse first line as JSON")
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
+        except orjson.JSONDecodeError:
+            # Try JSON Lines, iterating without materializing a list of lines
+            print("Trying JSON Lines format")
+            for line in io.StringIO(content):
+                try:
+                    first_item = orjson.loads(line)
+                    print(f"First line parsed successfully")
+                    print(f"Keys: {list(first_item.keys())}")
+                except orjson.JSONDecodeError:
+                    print("Could not parse first line as JSON")
+                break
     else:
         print(f"Error response: {response.text[:500]}")
         
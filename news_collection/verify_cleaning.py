@@ -1,41 +1,58 @@
 """Verify data cleaning results"""
 
+import re
+
 import pandas as pd
 
-df = pd.read_csv('gdelt_data_cleaned.csv')
+# Compiled once rather than re-looked-up in the re cache per call
+_DATE_FMT_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Prefer the Parquet output (typed columns, no text re-parsing); fall back
+# to the CSV when it is missing
+try:
+    df = pd.read_parquet('gdelt_data_cleaned.parquet')
+except (ImportError, FileNotFoundError):
+    df = pd.read_csv('gdelt_data_cleaned.csv')
 
 print('=== Data Cleaning Verification ===')
 print(f'Total articles: {len(df)}')
 print()
 
+# One sweep per column, fused into a single bad-row mask; the per-check
+# booleans below reuse these series instead of re-scanning the columns
+bad_date = ~df["published_at"].str.match(_DATE_FMT_RE)
+lang_lower = df["language"].str.lower()
+bad_lang = lang_lower.ne("english")
+bad_title = ~df["title_cleaned"].str.islower()
+bad = bad_date | bad_lang | bad_title
+
 print('1. Date format check:')
 print(f'   Sample dates: {df["published_at"].head(3).tolist()}')
-date_format_ok = df["published_at"].str.match(r'^\d{4}-\d{2}-\d{2}$').all()
+date_format_ok = not bad_date.any()
 print(f'   Date format consistent (YYYY-MM-DD): {date_format_ok}')
 print()
 
 print('2. Language check:')
-print(f'   Languages: {df["language"].value_counts().to_dict()}')
-all_english = df["language"].str.lower().eq("english").all()
+print(f'   Languages: {lang_lower.value_counts().to_dict()}')
+all_english = not bad_lang.any()
 print(f'   All English: {all_english}')
 print()
 
 print('3. Title cleaning check:')
 print(f'   Sample original: {df["title"].iloc[0]}')
 print(f'   Sample cleaned: {df["title_cleaned"].iloc[0]}')
-all_lowercase = df["title_cleaned"].str.islower().all()
+all_lowercase = not bad_title.any()
 print(f'   All lowercase: {all_lowercase}')
 print()
 
 print('=== Summary ===')
-if date_format_ok and all_english and all_lowercase:
+if not bad.any():
     print('[OK] All cleaning requirements met!')
 else:
-    print('[X] Some requirements not met')
+    print(f'[X] Some requirements not met (first failing row: {bad.idxmax()})')
     if not date_format_ok:
         print('  - Date format issue')
     if not all_english:
         print('  - Language filter issue')
     if not all_lowercase:
         print('  - Title lowercase issue')
-